@@ -6,18 +6,93 @@ Flask Application
 Main web server responsible for routing and serving the chart data
 Includes Twitch OAuth integration for user authentication
 """
-from flask import Flask, render_template, jsonify, request, redirect, session, url_for
-from data_processor import ChartDataProcessor
+from flask import Flask, render_template, jsonify, request, redirect, session, url_for, Response
+from flask.json.provider import DefaultJSONProvider
+from data_processor import ChartDataProcessor, MISSING_POSITION
 from comment_manager import CommentManager
+import numpy as np
+import atexit
+import gzip
+import hashlib
+import json
+import logging
 import os
+import queue
 import sys
-import requests
-from datetime import timedelta
-from functools import wraps
-from dotenv import load_dotenv
+import urllib.parse
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timedelta
+from functools import wraps, lru_cache
+from jinja2 import FileSystemBytecodeCache
+
+# dotenv is only needed for setups that use a .env file; production
+# deployments that pass env vars directly can skip the import
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
+# Numba is optional: when available the per-song stat reductions are
+# JIT-compiled, otherwise the NumPy fallback in build_song_stats is used
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# orjson is optional: when available all API responses are encoded with
+# its Rust serializer instead of stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Flask-Compress is optional: compresses dynamic responses on the wire;
+# the precomputed bodies below are gzipped once at startup instead
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+def dump_json_bytes(obj):
+    """Serialize an object to JSON bytes with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def load_json_bytes(data):
+    """Parse JSON bytes with the fastest available decoder"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Hand log records to a background listener thread so request threads
+# never block on stdout writes
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+def restart_log_listener():
+    """Restart the background log listener in the current process
+
+    Threads don't survive a fork: with preload_app the listener started
+    at import time only lives in the Gunicorn master, so workers would
+    enqueue records that are never written. The post_fork hook calls
+    this so each worker drains its own queue. The inherited listener
+    thread is already dead in the child, so it's simply replaced.
+    """
+    global _log_listener
+    _log_listener = QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+logger = logging.getLogger('qr')
+logger.setLevel(logging.INFO)
+logger.addHandler(QueueHandler(_log_queue))
 
 # Load environment variables from .env file
-load_dotenv()
+if load_dotenv is not None:
+    load_dotenv()
 
 # Admin user configuration
 ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
@@ -26,6 +101,28 @@ app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-this')
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)
 
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """JSON provider backed by orjson, so every jsonify call uses it"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+if Compress is not None:
+    Compress(app)
+
+# Templates never change in production: skip the per-render staleness
+# check and keep compiled templates on disk so worker restarts don't
+# recompile them
+if not app.debug and '--debug' not in sys.argv:
+    app.jinja_env.auto_reload = False
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 # Twitch OAuth configuration
 TWITCH_CLIENT_ID = os.getenv('TWITCH_CLIENT_ID')
 TWITCH_CLIENT_SECRET = os.getenv('TWITCH_CLIENT_SECRET')
@@ -34,9 +131,40 @@ TWITCH_AUTH_BASE_URL = 'https://id.twitch.tv/oauth2/authorize'
 TWITCH_TOKEN_URL = 'https://id.twitch.tv/oauth2/token'
 TWITCH_API_URL = 'https://api.twitch.tv/helix/users'
 
+# All login parameters are static, so build (and URL-encode) the full
+# authorization URL once at import time
+TWITCH_AUTH_URL = TWITCH_AUTH_BASE_URL + '?' + urllib.parse.urlencode({
+    'client_id': TWITCH_CLIENT_ID or '',
+    'redirect_uri': TWITCH_REDIRECT_URI or '',
+    'response_type': 'code',
+    'scope': 'user:read:email'
+})
+
+# (connect, read) timeouts so a slow Twitch response can't hang a worker
+TWITCH_TIMEOUT = (3, 5)
+
+@lru_cache(maxsize=1)
+def twitch_session():
+    """Build the pooled Twitch session on first OAuth use
+
+    requests drags in urllib3/charset detection/certifi, several hundred
+    ms of import per worker, so it's deferred until a login actually
+    happens. The session reuses TCP/TLS connections across callbacks.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    ))
+    return session
+
 # Get data file from command line argument or use default
 data_file = "Chart.xlsx"
-print(f"📂 Using default data file: {data_file}")
+logger.info("📂 Using default data file: %s", data_file)
 
 # Initialize data processor and comment manager
 processor = ChartDataProcessor(data_file)
@@ -45,13 +173,13 @@ comment_manager = CommentManager()
 # Load data on startup
 if os.environ.get('WERKZEUG_RUN_MAIN') == 'true' or not app.debug:
     success, message = processor.process_chart_data()
-    print(message)
-    
+    logger.info(message)
+
     if not success:
-        print("⚠️  Warning: Starting server without data. Please fix the data file.")
+        logger.warning("⚠️  Warning: Starting server without data. Please fix the data file.")
 else:
     success = False
-    print("🔄 Skipping data load in reloader parent process...")
+    logger.info("🔄 Skipping data load in reloader parent process...")
 
 def get_points_for_position(position):
     """Calculate points for a given position using the new tiered system"""
@@ -75,21 +203,13 @@ def get_points_for_position(position):
     else:
         return 0
 
-def calculate_total_points(song_data):
-    """Calculate total points for a song across all charts using new system"""
-    total_points = 0
-    for position in song_data["positions"].values():
-        if position is not None and position <= 100:
-            total_points += get_points_for_position(position)
-    return total_points
-
 def calculate_position_stats(song_data):
     """Calculate position statistics (#1s, Top 3s, Top 10s)"""
     num_ones = 0
     num_top3 = 0
     num_top10 = 0
     
-    for position in song_data["positions"].values():
+    for position in song_data["positions_list"][1:]:
         if position is not None:
             if position == 1:
                 num_ones += 1
@@ -107,30 +227,15 @@ def calculate_position_stats(song_data):
         "num_top10": num_top10
     }
 
-def count_number_ones(song_data):
-    """Count how many times a song reached #1"""
-    count = 0
-    for position in song_data["positions"].values():
-        if position == 1:
-            count += 1
-    return count
-
 def get_number_one_charts(song_data):
     """Get list of chart numbers where this song reached #1"""
-    charts = []
-    for chart_num, position in song_data["positions"].items():
-        if position == 1:
-            charts.append(chart_num)
-    return sorted(charts)
-
-def get_top_spot(song_data):
-    """Get the best (lowest) position achieved by a song"""
-    positions = [pos for pos in song_data["positions"].values() if pos is not None]
-    return min(positions) if positions else None
+    return [chart_num
+            for chart_num, position in enumerate(song_data["positions_list"])
+            if position == 1]
 
 def calculate_song_stats(song_data):
     """Calculate statistics for a song"""
-    positions = [pos for pos in song_data["positions"].values() if pos is not None]
+    positions = [pos for pos in song_data["positions_list"][1:] if pos is not None]
     
     if not positions:
         return {
@@ -147,13 +252,277 @@ def calculate_song_stats(song_data):
         "worst_position": max(positions)
     }
 
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def compute_song_stats(P, points_table, missing):
+        """Fused single-pass reduction over the positions matrix
+
+        Walks each song row once, summing points, counting #1s and
+        tracking the best position, parallelized across songs.
+        """
+        num_songs = P.shape[0]
+        total_points = np.zeros(num_songs, dtype=np.int64)
+        number_ones = np.zeros(num_songs, dtype=np.int64)
+        top_spots = np.full(num_songs, missing, dtype=np.int64)
+
+        for i in prange(num_songs):
+            for j in range(P.shape[1]):
+                p = P[i, j]
+                if 1 <= p <= 100:
+                    total_points[i] += points_table[p]
+                if p == 1:
+                    number_ones[i] += 1
+                if p < top_spots[i]:
+                    top_spots[i] = p
+
+        return total_points, number_ones, top_spots
+
+# Per-song stats cache, keyed by title (chart data is static after startup)
+_song_stats = {}
+
+def build_song_stats():
+    """Precompute per-song statistics so request handlers do O(1) dict lookups
+
+    Total points, number ones and top spot come from vectorized NumPy
+    reductions over the processor's positions matrix instead of per-song
+    Python loops.
+    """
+    _song_stats.clear()
+
+    # positions matrix: rows are song_ids, columns chart numbers,
+    # MISSING_POSITION marks "did not chart"
+    P = processor.positions_matrix
+
+    # Points lookup table indexed by position (0 = scores nothing)
+    points_table = np.array(
+        [get_points_for_position(p) for p in range(101)], dtype=np.int64
+    )
+
+    if njit is not None:
+        total_points, number_ones, top_spots = compute_song_stats(
+            P, points_table, MISSING_POSITION
+        )
+    else:
+        scoring = (P >= 1) & (P <= 100)
+        total_points = points_table[np.where(scoring, P, 0)].sum(axis=1)
+        number_ones = (P == 1).sum(axis=1)
+        # The sentinel is larger than any real position, so a plain row min
+        # yields the best charted position (or the sentinel if none exist)
+        top_spots = P.min(axis=1)
+
+    for song_id, song in enumerate(processor.songs):
+        top_spot = int(top_spots[song_id])
+        stats = {
+            "total_points": int(total_points[song_id]),
+            "number_ones": int(number_ones[song_id]),
+            "top_spot": top_spot if top_spot != MISSING_POSITION else None,
+            "position_stats": calculate_position_stats(song),
+            "number_one_charts": get_number_one_charts(song)
+        }
+        song["_stats"] = stats
+        # First occurrence wins, matching the old linear scan for duplicate titles
+        _song_stats.setdefault(song["title"], stats)
+
+        # Precomputed payloads for the song detail endpoints, which
+        # previously rebuilt the same lists on every request
+        song["_chart_data"] = [
+            {"chart": chart_num, "position": position}
+            for chart_num, position in enumerate(song["positions_list"])
+            if chart_num > 0 and position is not None
+        ]
+        song["_history_stats"] = calculate_song_stats(song)
+
+    # Drop chart responses cached from a previous data load
+    build_chart_body.cache_clear()
+
+@lru_cache(maxsize=None)
+def build_chart_body(chart_number):
+    """Build the serialized JSON body and ETag for a chart
+
+    Chart data is static after startup, so the result is memoized per
+    chart number; build_song_stats() clears the cache on reload.
+    """
+    # Special case for "All Songs" (chart_number = 0)
+    if chart_number == 0:
+        formatted_data = []
+        movement_counts = {
+            "new": 0,
+            "riser": 0,
+            "faller": 0,
+            "same": 0,
+            "reentry": 0
+        }
+        
+        for song in processor.songs:
+            latest_position = song["_latest_position"]
+            stats = song["_stats"]
+
+            formatted_data.append({
+                "position": latest_position if latest_position else 999,
+                "prev_position": "--",
+                "title": song["title"],
+                "total_charts": song["total_charts"],
+                "movement_type": "same",
+                "movement_value": 0,
+                "total_points": stats["total_points"],
+                "number_ones": stats["number_ones"],
+                "top_spot": stats["top_spot"],
+                "position_stats": stats["position_stats"],
+                "number_one_charts": stats["number_one_charts"]
+            })
+        
+        formatted_data.sort(key=lambda x: x["total_points"], reverse=True)
+        
+        for idx, item in enumerate(formatted_data, 1):
+            item["position"] = idx
+
+        body = dump_json_bytes({
+            "chart_number": 0,
+            "data": formatted_data,
+            "movement_counts": movement_counts
+        })
+        return body, gzip.compress(body, 6), hashlib.blake2b(body, digest_size=8).hexdigest()
+
+    # Regular chart processing
+    chart_data = processor.get_chart_data(chart_number)
+    
+    movement_counts = {
+        "new": 0,
+        "riser": 0,
+        "faller": 0,
+        "same": 0,
+        "reentry": 0
+    }
+    
+    empty_stats = {
+        "total_points": 0,
+        "number_ones": 0,
+        "top_spot": None,
+        "position_stats": {"num_ones": 0, "num_top3": 0, "num_top10": 0},
+        "number_one_charts": []
+    }
+
+    formatted_data = []
+    for item in chart_data:
+        stats = _song_stats.get(item["title"], empty_stats)
+
+        movement_type = "same"
+        movement_value = 0
+
+        if item["prev_position"] is None:
+            is_reentry = False
+            if chart_number > 1:
+                song = processor._song_index.get(item["title"])
+                # Any bit below chart_number means the song charted earlier
+                is_reentry = (song is not None
+                              and bool(song["chart_bits"] & ((1 << chart_number) - 1)))
+
+            movement_type = "reentry" if is_reentry else "new"
+        else:
+            movement_value = item["prev_position"] - item["position"]
+            if movement_value >= 1:
+                movement_type = "riser"
+            elif movement_value <= -1:
+                movement_type = "faller"
+            else:
+                movement_type = "same"
+        
+        movement_counts[movement_type] += 1
+        
+        formatted_data.append({
+            "position": item["position"],
+            "prev_position": item["prev_position"] if item["prev_position"] else "--",
+            "title": item["title"],
+            "total_charts": item["total_charts"],
+            "movement_type": movement_type,
+            "movement_value": movement_value,
+            "total_points": stats["total_points"],
+            "number_ones": stats["number_ones"],
+            "top_spot": stats["top_spot"],
+            "position_stats": stats["position_stats"],
+            "number_one_charts": stats["number_one_charts"]
+        })
+
+    body = dump_json_bytes({
+        "chart_number": chart_number,
+        "data": formatted_data,
+        "movement_counts": movement_counts
+    })
+    return body, gzip.compress(body, 6), hashlib.blake2b(body, digest_size=8).hexdigest()
+
+# Pre-serialized /api/info body; its contents only change on data load
+INFO_BODY = b""
+INFO_BODY_GZ = None
+
+# ETag shared by all endpoints whose data is fixed between data loads
+DATA_ETAG = ''
+
+def cacheable(max_age=86400):
+    """Mark responses as publicly cacheable between data loads
+
+    Sets Cache-Control and an ETag derived from the data file's mtime,
+    and answers 304 directly when the client already has the current
+    version - so browsers and CDNs keep these off the hot path.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if DATA_ETAG and request.headers.get('If-None-Match') == DATA_ETAG:
+                # A 304 repeats the validator it was matched against
+                return '', 304, {'ETag': DATA_ETAG}
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.headers['Cache-Control'] = f'public, max-age={max_age}'
+                if DATA_ETAG:
+                    response.headers['ETag'] = DATA_ETAG
+            return response
+        return wrapped
+    return decorator
+
+def static_json_response(body, body_gz, headers=None):
+    """Serve a precomputed JSON body, using the pre-gzipped variant when
+    the client accepts it (skipping per-request compression entirely)"""
+    headers = dict(headers) if headers else {}
+    if body_gz is not None:
+        # Two encodings exist for this URL, so caches must key on
+        # Accept-Encoding for the identity variant too
+        headers['Vary'] = 'Accept-Encoding'
+        if 'gzip' in request.accept_encodings:
+            headers['Content-Encoding'] = 'gzip'
+            body = body_gz
+    return Response(body, mimetype='application/json', headers=headers)
+
+def build_static_bodies():
+    """Pre-serialize responses that are fixed after data load"""
+    global INFO_BODY, INFO_BODY_GZ, DATA_ETAG
+    try:
+        DATA_ETAG = hashlib.blake2b(
+            f"{data_file}:{os.path.getmtime(data_file)}".encode(),
+            digest_size=8
+        ).hexdigest()
+    except OSError:
+        DATA_ETAG = ''
+    INFO_BODY = dump_json_bytes({
+        "num_charts": processor.num_charts,
+        "num_songs": len(processor.songs),
+        "has_data": success
+    })
+    INFO_BODY_GZ = gzip.compress(INFO_BODY, 6)
+    if success:
+        # Warm the cache for the heaviest chart response so the first
+        # visitor doesn't pay the build cost
+        build_chart_body(0)
+
+if success:
+    build_song_stats()
+build_static_bodies()
+
 # ============ AUTHENTICATION ROUTES ============
 
 @app.route('/auth/login')
 def auth_login():
     """Redirect user to Twitch OAuth login page"""
-    auth_url = f"{TWITCH_AUTH_BASE_URL}?client_id={TWITCH_CLIENT_ID}&redirect_uri={TWITCH_REDIRECT_URI}&response_type=code&scope=user:read:email"
-    return redirect(auth_url)
+    return redirect(TWITCH_AUTH_URL)
 
 @app.route('/auth/callback')
 def auth_callback():
@@ -165,7 +534,7 @@ def auth_callback():
     
     try:
         # Exchange code for access token
-        token_response = requests.post(
+        token_response = twitch_session().post(
             TWITCH_TOKEN_URL,
             data={
                 'client_id': TWITCH_CLIENT_ID,
@@ -173,31 +542,33 @@ def auth_callback():
                 'code': code,
                 'grant_type': 'authorization_code',
                 'redirect_uri': TWITCH_REDIRECT_URI
-            }
+            },
+            timeout=TWITCH_TIMEOUT
         )
         
         if token_response.status_code != 200:
             return "Error: Failed to exchange code for token", 400
         
-        token_data = token_response.json()
+        token_data = load_json_bytes(token_response.content)
         access_token = token_data.get('access_token')
         
         # Get user info from Twitch API (includes display_name with proper casing)
-        user_response = requests.get(
+        user_response = twitch_session().get(
             TWITCH_API_URL,
             headers={
                 'Authorization': f'Bearer {access_token}',
                 'Client-ID': TWITCH_CLIENT_ID
-            }
+            },
+            timeout=TWITCH_TIMEOUT
         )
         
         if user_response.status_code != 200:
             return "Error: Failed to get user info", 400
         
-        user_data = user_response.json()
         # Use display_name (properly cased) instead of login (lowercase)
-        username = user_data['data'][0]['display_name']
-        profile_pic = user_data['data'][0]['profile_image_url']
+        user_data = load_json_bytes(user_response.content)['data'][0]
+        username = user_data['display_name']
+        profile_pic = user_data['profile_image_url']
         
         # Store in session
         session.permanent = True
@@ -205,13 +576,13 @@ def auth_callback():
         session['profile_pic'] = profile_pic
         session['access_token'] = access_token
         
-        print(f"✅ User '{username}' logged in via Twitch")
+        logger.info("✅ User '%s' logged in via Twitch", username)
         
         # Redirect back to main page
         return redirect('/')
         
     except Exception as e:
-        print(f"❌ OAuth error: {e}")
+        logger.error("❌ OAuth error: %s", e)
         return f"Error: {str(e)}", 400
 
 @app.route('/auth/logout', methods=['POST'])
@@ -220,7 +591,7 @@ def auth_logout():
     if 'user' in session:
         username = session.get('user')
         session.clear()
-        print(f"ℹ️  User '{username}' logged out")
+        logger.info("ℹ️  User '%s' logged out", username)
     return jsonify({"success": True}), 200
 
 @app.route('/api/auth/status')
@@ -271,193 +642,101 @@ def get_chart(chart_number):
     """API endpoint to get data for a specific chart"""
     if not success:
         return jsonify({"error": "No data available"}), 500
-    
+
     if chart_number < 0 or chart_number > processor.num_charts:
         return jsonify({"error": "Invalid chart number"}), 400
-    
-    # Special case for "All Songs" (chart_number = 0)
-    if chart_number == 0:
-        formatted_data = []
-        movement_counts = {
-            "new": 0,
-            "riser": 0,
-            "faller": 0,
-            "same": 0,
-            "reentry": 0
-        }
-        
-        for song in processor.songs:
-            latest_position = song["positions"].get(processor.num_charts)
-            if latest_position is None:
-                for i in range(processor.num_charts, 0, -1):
-                    if song["positions"].get(i) is not None:
-                        latest_position = song["positions"].get(i)
-                        break
-            
-            total_points = calculate_total_points(song)
-            number_ones = count_number_ones(song)
-            top_spot = get_top_spot(song)
-            position_stats = calculate_position_stats(song)
-            number_one_charts = get_number_one_charts(song)
-            
-            formatted_data.append({
-                "position": latest_position if latest_position else 999,
-                "prev_position": "--",
-                "title": song["title"],
-                "total_charts": song["total_charts"],
-                "movement_type": "same",
-                "movement_value": 0,
-                "total_points": total_points,
-                "number_ones": number_ones,
-                "top_spot": top_spot,
-                "position_stats": position_stats,
-                "number_one_charts": number_one_charts
-            })
-        
-        formatted_data.sort(key=lambda x: x["total_points"], reverse=True)
-        
-        for idx, item in enumerate(formatted_data, 1):
-            item["position"] = idx
-        
-        return jsonify({
-            "chart_number": 0,
-            "data": formatted_data,
-            "movement_counts": movement_counts
-        })
-    
-    # Regular chart processing
-    chart_data = processor.get_chart_data(chart_number)
-    
-    movement_counts = {
-        "new": 0,
-        "riser": 0,
-        "faller": 0,
-        "same": 0,
-        "reentry": 0
-    }
-    
-    formatted_data = []
-    for item in chart_data:
-        total_points = 0
-        number_ones = 0
-        top_spot = None
-        position_stats = {"num_ones": 0, "num_top3": 0, "num_top10": 0}
-        number_one_charts = []
-        
-        for song in processor.songs:
-            if song["title"] == item["title"]:
-                total_points = calculate_total_points(song)
-                number_ones = count_number_ones(song)
-                top_spot = get_top_spot(song)
-                position_stats = calculate_position_stats(song)
-                number_one_charts = get_number_one_charts(song)
-                break
-        
-        movement_type = "same"
-        movement_value = 0
-        
-        if item["prev_position"] is None:
-            is_reentry = False
-            if chart_number > 1:
-                for song in processor.songs:
-                    if song["title"] == item["title"]:
-                        for chart_num in range(1, chart_number):
-                            if song["positions"].get(chart_num) is not None:
-                                is_reentry = True
-                                break
-                        break
-            
-            movement_type = "reentry" if is_reentry else "new"
-        else:
-            movement_value = item["prev_position"] - item["position"]
-            if movement_value >= 1:
-                movement_type = "riser"
-            elif movement_value <= -1:
-                movement_type = "faller"
-            else:
-                movement_type = "same"
-        
-        movement_counts[movement_type] += 1
-        
-        formatted_data.append({
-            "position": item["position"],
-            "prev_position": item["prev_position"] if item["prev_position"] else "--",
-            "title": item["title"],
-            "total_charts": item["total_charts"],
-            "movement_type": movement_type,
-            "movement_value": movement_value,
-            "total_points": total_points,
-            "number_ones": number_ones,
-            "top_spot": top_spot,
-            "position_stats": position_stats,
-            "number_one_charts": number_one_charts
-        })
-    
-    return jsonify({
-        "chart_number": chart_number,
-        "data": formatted_data,
-        "movement_counts": movement_counts
-    })
+
+    body, body_gz, etag = build_chart_body(chart_number)
+
+    if request.headers.get('If-None-Match') == etag:
+        # A 304 repeats the validator it was matched against
+        return '', 304, {'ETag': etag}
+
+    return static_json_response(body, body_gz,
+                                {'ETag': etag, 'Cache-Control': 'public, max-age=60'})
 
 @app.route('/api/song/<path:song_title>')
+@cacheable(max_age=60)
 def get_song(song_title):
     """API endpoint to get complete song data including history and stats"""
     if not success:
         return jsonify({"error": "No data available"}), 500
     
     song_history = processor.get_song_history(song_title)
-    
+
     if song_history is None:
         return jsonify({"error": "Song not found"}), 404
-    
-    chart_data = []
-    for chart_num in range(1, processor.num_charts + 1):
-        position = song_history["positions"].get(chart_num)
-        if position is not None:
-            chart_data.append({
-                "chart": chart_num,
-                "position": position
-            })
-    
-    stats = calculate_song_stats(song_history)
-    
+
     return jsonify({
         "title": song_history["title"],
-        "chart_data": chart_data,
-        "stats": stats
+        "chart_data": song_history["_chart_data"],
+        "stats": song_history["_history_stats"]
     })
 
 @app.route('/api/song-history/<path:song_title>')
+@cacheable(max_age=60)
 def get_song_history(song_title):
     """API endpoint to get the chart history for a specific song"""
     if not success:
         return jsonify({"error": "No data available"}), 500
     
     song_history = processor.get_song_history(song_title)
-    
+
     if song_history is None:
         return jsonify({"error": "Song not found"}), 404
-    
-    chart_data = []
-    for chart_num in range(1, processor.num_charts + 1):
-        position = song_history["positions"].get(chart_num)
-        if position is not None:
-            chart_data.append({
-                "chart": chart_num,
-                "position": position
-            })
-    
+
     return jsonify({
         "title": song_history["title"],
-        "chart_data": chart_data,
+        "chart_data": song_history["_chart_data"],
         "total_charts": song_history["total_charts"]
     })
 
 @app.route('/api/comments/<path:song_title>', methods=['GET'])
 def get_comments(song_title):
-    """API endpoint to get comments for a song"""
-    comments = comment_manager.get_comments(song_title)
-    return jsonify({"comments": comments})
+    """API endpoint to get comments for a song
+
+    Paginated: pass ?before=<timestamp> and ?before_id=<id> of the oldest
+    comment received to fetch the next page. Both cursor fields are null
+    on the last page.
+    """
+    before = None
+    before_arg = request.args.get('before')
+    if before_arg:
+        try:
+            before = datetime.fromisoformat(before_arg)
+        except ValueError:
+            return jsonify({"error": "Invalid 'before' cursor"}), 400
+    before_id = request.args.get('before_id', type=int)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 100)
+
+    comments = comment_manager.get_comments(song_title, before=before,
+                                            before_id=before_id, limit=limit)
+    if len(comments) == limit:
+        next_cursor = comments[-1]['timestamp']
+        next_cursor_id = comments[-1]['id']
+    else:
+        next_cursor = None
+        next_cursor_id = None
+    return jsonify({
+        "comments": comments,
+        "next_cursor": next_cursor,
+        "next_cursor_id": next_cursor_id
+    })
+
+@app.route('/api/comments/bulk', methods=['POST'])
+def get_comments_bulk():
+    """API endpoint to get comments for several songs in one request
+
+    Takes {"song_titles": [...]} and returns {"comments": {title: [...]}},
+    so pages listing many songs avoid one request per song.
+    """
+    data = request.json
+
+    if not data or 'song_titles' not in data or not isinstance(data['song_titles'], list):
+        return jsonify({"error": "Missing required field 'song_titles'"}), 400
+
+    song_titles = [title for title in data['song_titles'] if isinstance(title, str)][:100]
+    return jsonify({"comments": comment_manager.get_comments_bulk(song_titles)})
 
 @app.route('/api/comments', methods=['POST'])
 def add_comment():
@@ -546,13 +825,10 @@ def toggle_comment_like(comment_id):
         return jsonify({"error": "Failed to toggle like"}), 500
 
 @app.route('/api/info')
+@cacheable(max_age=3600)
 def get_info():
     """API endpoint to get general information about the charts"""
-    return jsonify({
-        "num_charts": processor.num_charts,
-        "num_songs": len(processor.songs),
-        "has_data": success
-    })
+    return static_json_response(INFO_BODY, INFO_BODY_GZ)
 
 # Close database connection when app shuts down
 def close_db_connection():
@@ -561,9 +837,8 @@ def close_db_connection():
         if hasattr(comment_manager, 'close_connection'):
             comment_manager.close_connection()
     except Exception as e:
-        print(f"⚠️  Error closing database connection: {e}")
+        logger.warning("⚠️  Error closing database connection: %s", e)
 
-import atexit
 atexit.register(close_db_connection)
 
 if __name__ == '__main__':
@@ -586,5 +861,11 @@ if __name__ == '__main__':
         print("🔧 Running in DEBUG mode")
         app.run(port=5001, debug=True)
     else:
-        print("🚀 Running in PRODUCTION mode")
-        app.run(host='0.0.0.0', port=5001, debug=False)
\ No newline at end of file
+        # Werkzeug's built-in server is single-threaded: every request
+        # serializes behind one worker, so production must run under a
+        # real WSGI server with multiple workers
+        sys.exit(
+            "🚀 Production mode no longer uses the built-in dev server.\n"
+            "   Run:  gunicorn -c gunicorn_config.py app:app\n"
+            "   (or pass --debug for local development)"
+        )
\ No newline at end of file
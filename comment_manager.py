@@ -7,14 +7,28 @@ Handles loading, saving, and managing comments for songs
 Stores comments in MariaDB database with user, text, timestamp, and profile picture
 """
 import pymysql
+import logging
 import os
+from collections import defaultdict
+from dbutils.pooled_db import PooledDB
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict
-from dotenv import load_dotenv
 import urllib.parse
 
+# dotenv is only needed for setups that use a .env file
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    load_dotenv = None
+
 # Load environment variables
-load_dotenv()
+if load_dotenv is not None:
+    load_dotenv()
+
+# Child of the app's 'qr' logger, so records go through its background
+# queue listener instead of blocking on stdout
+logger = logging.getLogger('qr.comments')
 
 # MariaDB Database Configuration Constants
 # You can use either a JDBC-style URL or individual components
@@ -39,95 +53,265 @@ def parse_db_url(url: str) -> Dict[str, str]:
         'scheme': parsed.scheme
     }
 
+@lru_cache(maxsize=4096)
+def normalize_song_key(song_title: str) -> str:
+    """Normalize a song title to its canonical lowercase comment key
+
+    Titles repeat heavily across requests, so the result is memoized.
+    """
+    return song_title.lower().strip()
+
 class CommentManager:
     def __init__(self):
-        """Initialize comment manager with database connection"""
-        self.connection = None
-        self._init_connection()
-    
-    def _init_connection(self):
-        """Initialize database connection"""
+        """Initialize comment manager with a database connection pool"""
+        self.pool = None
+        self.read_pool = None
+        self._init_pool()
+        if self.pool:
+            self._ensure_indexes()
+
+    def _init_pool(self):
+        """Initialize the database connection pools
+
+        A pool (instead of one long-lived connection) lets concurrent
+        requests query in parallel and transparently replaces stale
+        connections (ping=1 checks them on checkout). Reads get their own
+        autocommit pool: plain SELECTs then run as read-only transactions,
+        which InnoDB serves without undo-log or read-view bookkeeping.
+        """
         try:
             # Parse database URL
             db_info = parse_db_url(DB_URL)
-            
-            self.connection = pymysql.connect(
+
+            pool_kwargs = dict(
+                creator=pymysql,
+                mincached=2,
+                maxcached=10,
+                maxconnections=20,
+                blocking=True,
+                ping=1,
                 host=db_info['host'],
                 port=int(db_info['port']),
                 database=db_info['database'],
                 user=DB_USER,
                 password=DB_PASSWORD,
                 charset='utf8mb4',
-                autocommit=False
+                # Report matched rows (not only changed ones) so rowcount
+                # checks on guarded UPDATEs stay reliable
+                client_flag=pymysql.constants.CLIENT.FOUND_ROWS
             )
-            print("✅ Connected to MariaDB database")
+            self.pool = PooledDB(autocommit=False, **pool_kwargs)
+            self.read_pool = PooledDB(autocommit=True, **pool_kwargs)
+            logger.info("✅ Connected to MariaDB database (pooled)")
         except Exception as e:
-            print(f"⚠️  Error connecting to database: {e}")
-            self.connection = None
-    
+            logger.warning("⚠️  Error connecting to database: %s", e)
+            self.pool = None
+            self.read_pool = None
+
+    def _ensure_indexes(self):
+        """Create the indexes the comment queries rely on, if missing
+
+        Idempotent (IF NOT EXISTS), so it's safe to run on every startup;
+        existing deployments get the indexes without a manual migration.
+        """
+        # comment_likes already carries idx_comment_id and the unique
+        # (comment_id, user_name) key from the base schema; only the
+        # composite index covering the WHERE song_title + ORDER BY
+        # created_at DESC path is missing there
+        statement = (
+            f"CREATE INDEX IF NOT EXISTS idx_comments_song_created "
+            f"ON {DB_TABLE} (song_title, created_at DESC)"
+        )
+        self._execute_query(statement)
+
     def _execute_query(self, query: str, params: tuple = None) -> List[Dict]:
         """Execute a database query and return results"""
-        if not self.connection:
-            print("❌ No database connection available")
+        if not self.pool:
+            logger.warning("❌ No database connection available")
             return []
-        
+
+        connection = None
         try:
-            with self.connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            connection = self.pool.connection()
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
                 cursor.execute(query, params)
-                
+
                 # If it's a SELECT query, fetch results
                 if query.strip().upper().startswith('SELECT'):
                     return cursor.fetchall()
                 else:
                     # For INSERT/UPDATE/DELETE, commit the transaction
-                    self.connection.commit()
+                    connection.commit()
                     return []
-                    
+
         except Exception as e:
-            print(f"⚠️  Database query error: {e}")
-            if self.connection:
-                self.connection.rollback()
+            logger.warning("⚠️  Database query error: %s", e)
+            if connection:
+                connection.rollback()
             return []
+        finally:
+            if connection:
+                # Returns the connection to the pool
+                connection.close()
     
-    def get_comments(self, song_title: str) -> List[Dict]:
-        """Get all comments for a song"""
+    def _execute_read(self, query: str, params: tuple = None) -> List[Dict]:
+        """Run a SELECT on the autocommit read pool and return all rows
+
+        No explicit transaction is opened or committed for pure reads;
+        see _init_pool for why the read pool is separate.
+        """
+        if not self.read_pool:
+            logger.warning("❌ No database connection available")
+            return []
+
+        connection = None
+        try:
+            connection = self.read_pool.connection()
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+        except Exception as e:
+            logger.warning("⚠️  Database query error: %s", e)
+            return []
+        finally:
+            if connection:
+                # Returns the connection to the pool
+                connection.close()
+
+    def _execute_update(self, query: str, params: tuple = None) -> int:
+        """Execute a write query and return the number of affected rows"""
+        if not self.pool:
+            logger.warning("❌ No database connection available")
+            return 0
+
+        connection = None
+        try:
+            connection = self.pool.connection()
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+                affected = cursor.rowcount
+            connection.commit()
+            return affected
+        except Exception as e:
+            logger.warning("⚠️  Database query error: %s", e)
+            if connection:
+                connection.rollback()
+            return 0
+        finally:
+            if connection:
+                # Returns the connection to the pool
+                connection.close()
+
+    def get_comments(self, song_title: str, before: datetime = None,
+                     before_id: int = None, limit: int = 50) -> List[Dict]:
+        """Get comments for a song, newest first, one bounded page at a time
+
+        Keyset pagination: pass the timestamp and id of the oldest comment
+        of the previous page as `before`/`before_id` to fetch the next
+        page. The id tiebreak matters because created_at has second
+        granularity — a strict created_at < cursor alone would skip
+        comments sharing the boundary second. Unlike OFFSET, the
+        (song_title, created_at) index serves the range scan directly,
+        so page cost stays flat no matter how long the thread grows.
+        """
         # Normalize song title to lowercase for consistency
-        song_key = song_title.lower().strip()
-        
+        song_key = normalize_song_key(song_title)
+
+        # The correlated COUNT is a covered lookup on idx_comment_id and
+        # avoids the LEFT JOIN + GROUP BY temp table over five wide columns.
+        # Field names and the ISO timestamp come straight from the SELECT,
+        # so no per-row renaming or .isoformat() is needed in Python.
         query = f"""
-        SELECT c.id, c.user_name, c.comment_text, c.created_at as timestamp, c.profile_pic,
-               COUNT(cl.id) as like_count
+        SELECT c.id, c.user_name AS `user`, c.comment_text AS `text`,
+               DATE_FORMAT(c.created_at, '%%Y-%%m-%%dT%%H:%%i:%%s') AS timestamp, c.profile_pic,
+               (SELECT COUNT(*) FROM comment_likes cl WHERE cl.comment_id = c.id) as like_count
         FROM {DB_TABLE} c
-        LEFT JOIN comment_likes cl ON c.id = cl.comment_id
-        WHERE LOWER(c.song_title) = %s
-        GROUP BY c.id, c.user_name, c.comment_text, c.created_at, c.profile_pic
-        ORDER BY c.created_at DESC
+        WHERE c.song_title = %s
+          AND (%s IS NULL OR c.created_at < %s
+               OR (c.created_at = %s AND c.id < %s))
+        ORDER BY c.created_at DESC, c.id DESC
+        LIMIT %s
         """
-        
-        results = self._execute_query(query, (song_key,))
-        
-        # Get likes for each comment
-        for result in results:
-            likes_query = """
-            SELECT user_name FROM comment_likes WHERE comment_id = %s
+
+        # Without an id the tiebreak clause never matches (id < 0) and the
+        # cursor degrades to the plain timestamp comparison
+        results = self._execute_read(
+            query,
+            (song_key, before, before, before,
+             before_id if before_id is not None else 0, int(limit))
+        )
+
+        # Get likes for all returned comments in a single round-trip
+        # instead of one query per comment
+        if results:
+            comment_ids = [result['id'] for result in results]
+            placeholders = ', '.join(['%s'] * len(comment_ids))
+            likes_query = f"""
+            SELECT comment_id, user_name FROM comment_likes WHERE comment_id IN ({placeholders})
             """
-            likes_results = self._execute_query(likes_query, (result['id'],))
-            result['liked_by'] = [like['user_name'] for like in likes_results]
-        
-        # Convert datetime objects to ISO format strings for JSON serialization
-        for result in results:
-            if 'timestamp' in result and result['timestamp']:
-                result['timestamp'] = result['timestamp'].isoformat()
-            # Rename fields to match the old JSON format
-            result['user'] = result.pop('user_name', result.get('user_name', ''))
-            result['text'] = result.pop('comment_text', result.get('comment_text', ''))
-        
+            liked_by = defaultdict(list)
+            for like in self._execute_read(likes_query, tuple(comment_ids)):
+                liked_by[like['comment_id']].append(like['user_name'])
+            for result in results:
+                result['liked_by'] = liked_by[result['id']]
+
         return results
     
+    def get_comments_bulk(self, song_titles: List[str]) -> Dict[str, List[Dict]]:
+        """Get comments for several songs at once, keyed by the given titles
+
+        Pages that show multiple songs otherwise call get_comments once
+        per song (N+1 round-trips). This fetches everything in two
+        queries — one IN() over the titles, one IN() over the returned
+        comment ids for likes — and buckets the rows per song.
+        """
+        comments_by_title = {title: [] for title in song_titles}
+        if not song_titles:
+            return comments_by_title
+
+        # Several input titles may normalize to the same comment key;
+        # dedupe the titles first so a repeated input doesn't get every
+        # comment appended to its bucket once per occurrence
+        titles_by_key = defaultdict(list)
+        for title in dict.fromkeys(song_titles):
+            titles_by_key[normalize_song_key(title)].append(title)
+
+        placeholders = ', '.join(['%s'] * len(titles_by_key))
+        query = f"""
+        SELECT c.id, c.song_title, c.user_name AS `user`, c.comment_text AS `text`,
+               DATE_FORMAT(c.created_at, '%%Y-%%m-%%dT%%H:%%i:%%s') AS timestamp, c.profile_pic,
+               (SELECT COUNT(*) FROM comment_likes cl WHERE cl.comment_id = c.id) as like_count
+        FROM {DB_TABLE} c
+        WHERE c.song_title IN ({placeholders})
+        ORDER BY c.created_at DESC
+        """
+        results = self._execute_read(query, tuple(titles_by_key))
+
+        # One likes query across all returned comments
+        if results:
+            comment_ids = [result['id'] for result in results]
+            placeholders = ', '.join(['%s'] * len(comment_ids))
+            likes_query = f"""
+            SELECT comment_id, user_name FROM comment_likes WHERE comment_id IN ({placeholders})
+            """
+            liked_by = defaultdict(list)
+            for like in self._execute_read(likes_query, tuple(comment_ids)):
+                liked_by[like['comment_id']].append(like['user_name'])
+        else:
+            liked_by = defaultdict(list)
+
+        for result in results:
+            result['liked_by'] = liked_by[result['id']]
+            song_key = normalize_song_key(result.pop('song_title'))
+            for title in titles_by_key.get(song_key, ()):
+                comments_by_title[title].append(result)
+
+        return comments_by_title
+
     def add_comment(self, song_title: str, user: str, text: str, profile_pic: str = None) -> bool:
         """Add a comment to a song with optional profile picture"""
         # Normalize song title to lowercase for consistency
-        song_key = song_title.lower().strip()
+        song_key = normalize_song_key(song_title)
         
         # Limit text to 200 characters and sanitize
         text = text.strip()[:200]
@@ -147,118 +331,110 @@ class CommentManager:
         
         try:
             self._execute_query(query, params)
-            print(f"✅ Comment added for song '{song_title}' by user '{user}'")
+            logger.info("✅ Comment added for song '%s' by user '%s'", song_title, user)
             return True
         except Exception as e:
-            print(f"❌ Failed to add comment: {e}")
+            logger.error("❌ Failed to add comment: %s", e)
             return False
     
     def update_comment(self, comment_id: int, new_text: str, user: str, is_admin: bool = False) -> bool:
-        """Update a comment if user owns it or is admin"""
-        # First check if comment exists and get owner
-        check_query = f"""
-        SELECT user_name FROM {DB_TABLE} WHERE id = %s
+        """Update a comment if user owns it or is admin
+
+        The ownership check is folded into the UPDATE itself (one
+        round-trip instead of SELECT-then-UPDATE): the WHERE clause only
+        matches when the user owns the comment or is admin, and rowcount
+        tells us whether that was the case.
         """
-        
-        results = self._execute_query(check_query, (comment_id,))
-        if not results:
-            print(f"❌ Comment {comment_id} not found")
-            return False
-        
-        comment_owner = results[0]['user_name']
-        
-        # Check permissions
-        if not is_admin and user != comment_owner:
-            print(f"❌ User {user} not authorized to edit comment {comment_id}")
-            return False
-        
         # Limit text to 200 characters and sanitize
         new_text = new_text.strip()[:200]
-        
-        # Update comment
+
         update_query = f"""
-        UPDATE {DB_TABLE} 
-        SET comment_text = %s 
-        WHERE id = %s
+        UPDATE {DB_TABLE}
+        SET comment_text = %s
+        WHERE id = %s AND (user_name = %s OR %s)
         """
-        
-        try:
-            self._execute_query(update_query, (new_text, comment_id))
-            print(f"✅ Comment {comment_id} updated by user '{user}'")
+
+        affected = self._execute_update(
+            update_query, (new_text, comment_id, user, is_admin)
+        )
+        if affected == 1:
+            logger.info("✅ Comment %s updated by user '%s'", comment_id, user)
             return True
-        except Exception as e:
-            print(f"❌ Failed to update comment {comment_id}: {e}")
-            return False
-    
+
+        logger.warning("❌ Comment %s not found or user '%s' not authorized to edit it", comment_id, user)
+        return False
+
     def delete_comment(self, comment_id: int, user: str, is_admin: bool = False) -> bool:
-        """Delete a comment if user owns it or is admin"""
-        # First check if comment exists and get owner
-        check_query = f"""
-        SELECT user_name FROM {DB_TABLE} WHERE id = %s
+        """Delete a comment if user owns it or is admin
+
+        Same single-statement pattern as update_comment: the permission
+        check lives in the WHERE clause and rowcount reports the outcome.
         """
-        
-        results = self._execute_query(check_query, (comment_id,))
-        if not results:
-            print(f"❌ Comment {comment_id} not found")
-            return False
-        
-        comment_owner = results[0]['user_name']
-        
-        # Check permissions
-        if not is_admin and user != comment_owner:
-            print(f"❌ User {user} not authorized to delete comment {comment_id}")
-            return False
-        
-        # Delete comment
         delete_query = f"""
-        DELETE FROM {DB_TABLE} WHERE id = %s
+        DELETE FROM {DB_TABLE} WHERE id = %s AND (user_name = %s OR %s)
         """
-        
-        try:
-            self._execute_query(delete_query, (comment_id,))
-            print(f"✅ Comment {comment_id} deleted by user '{user}'")
+
+        affected = self._execute_update(delete_query, (comment_id, user, is_admin))
+        if affected == 1:
+            logger.info("✅ Comment %s deleted by user '%s'", comment_id, user)
             return True
-        except Exception as e:
-            print(f"❌ Failed to delete comment {comment_id}: {e}")
-            return False
+
+        logger.warning("❌ Comment %s not found or user '%s' not authorized to delete it", comment_id, user)
+        return False
     
     def toggle_like(self, comment_id: int, user: str) -> bool:
-        """Toggle like for a comment (like if not liked, unlike if already liked)"""
-        # Check if user already liked this comment
-        check_query = """
-        SELECT id FROM comment_likes WHERE comment_id = %s AND user_name = %s
+        """Toggle like for a comment (like if not liked, unlike if already liked)
+
+        Tries the INSERT first: the unique (comment_id, user_name) index
+        rejects a duplicate like atomically, in which case the like is
+        removed instead. One round-trip on the common (like) path, two on
+        unlike, and no race window between check and write.
         """
-        
-        results = self._execute_query(check_query, (comment_id, user))
-        
-        if results:
-            # Unlike - remove the like
-            delete_query = """
-            DELETE FROM comment_likes WHERE comment_id = %s AND user_name = %s
-            """
-            try:
-                self._execute_query(delete_query, (comment_id, user))
-                print(f"✅ User '{user}' unliked comment {comment_id}")
-                return True
-            except Exception as e:
-                print(f"❌ Failed to unlike comment {comment_id}: {e}")
-                return False
-        else:
-            # Like - add the like
-            insert_query = """
-            INSERT INTO comment_likes (comment_id, user_name, created_at)
-            VALUES (%s, %s, %s)
-            """
-            try:
-                self._execute_query(insert_query, (comment_id, user, datetime.now()))
-                print(f"✅ User '{user}' liked comment {comment_id}")
-                return True
-            except Exception as e:
-                print(f"❌ Failed to like comment {comment_id}: {e}")
-                return False
+        if not self.pool:
+            logger.warning("❌ No database connection available")
+            return False
+
+        connection = None
+        try:
+            connection = self.pool.connection()
+            with connection.cursor() as cursor:
+                try:
+                    cursor.execute(
+                        """
+                        INSERT INTO comment_likes (comment_id, user_name, created_at)
+                        VALUES (%s, %s, %s)
+                        """,
+                        (comment_id, user, datetime.now())
+                    )
+                    logger.info("✅ User '%s' liked comment %s", user, comment_id)
+                except pymysql.err.IntegrityError as e:
+                    # 1062 = duplicate key: the user already liked this
+                    # comment, so toggle the like off instead
+                    if e.args[0] != 1062:
+                        raise
+                    cursor.execute(
+                        """
+                        DELETE FROM comment_likes WHERE comment_id = %s AND user_name = %s
+                        """,
+                        (comment_id, user)
+                    )
+                    logger.info("✅ User '%s' unliked comment %s", user, comment_id)
+            connection.commit()
+            return True
+        except Exception as e:
+            logger.error("❌ Failed to toggle like for comment %s: %s", comment_id, e)
+            if connection:
+                connection.rollback()
+            return False
+        finally:
+            if connection:
+                # Returns the connection to the pool
+                connection.close()
     
     def close_connection(self):
-        """Close the database connection"""
-        if self.connection:
-            self.connection.close()
-            print("🔌 Database connection closed")
+        """Close all pooled database connections"""
+        if self.read_pool:
+            self.read_pool.close()
+        if self.pool:
+            self.pool.close()
+            logger.info("🔌 Database connection pool closed")
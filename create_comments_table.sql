@@ -31,6 +31,11 @@ CREATE TABLE IF NOT EXISTS comment_likes (
     INDEX idx_comment_id (comment_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Supporting index for the comment queries (also created automatically
+-- at startup by CommentManager._ensure_indexes); comment_likes is
+-- already covered by idx_comment_id and unique_user_comment above
+CREATE INDEX IF NOT EXISTS idx_comments_song_created ON comments(song_title, created_at DESC);
+
 -- Optional: Add some sample data for testing
 -- INSERT INTO comments (song_title, user_name, comment_text, profile_pic) VALUES
 -- ('test song', 'TestUser', 'This is a test comment!', 'https://example.com/profile.jpg');
@@ -6,11 +6,65 @@ Data Processor Module
 Responsible for reading and processing the Excel/CSV chart data
 """
 import pandas as pd
+import numpy as np
+import logging
 import re
 import unicodedata
 import os
+import pickle
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Tuple, Optional
 
+# python-calamine is optional; when available pandas parses Excel with its
+# Rust-based reader, which is several times faster than openpyxl
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = {'engine': 'calamine'}
+except ImportError:
+    _EXCEL_ENGINE = {}
+
+# Child of the app's 'qr' logger, so records go through its background
+# queue listener instead of blocking on stdout
+logger = logging.getLogger('qr.data')
+
+# Sentinel stored in the positions matrix for "did not chart"
+MISSING_POSITION = int(np.iinfo(np.int16).max)
+
+# Precompiled patterns used by normalize_song_title (compiling per call
+# made title normalization the dominant cost of data loading)
+_WHITESPACE_RE = re.compile(r'\s+')
+_DISALLOWED_RE = re.compile(r'[^\w\s\-\.,:;&\(\)\'\"]+')
+
+@lru_cache(maxsize=1)
+def _symbol_translate_table() -> Dict[int, None]:
+    """Translate table deleting every Unicode symbol character (category S*)
+
+    Built lazily on first use; str.translate with this table replaces the
+    per-character Python loop over unicodedata.category.
+    """
+    return {
+        codepoint: None
+        for codepoint in range(0x110000)
+        if unicodedata.category(chr(codepoint))[0] == 'S'
+    }
+
+@lru_cache(maxsize=8192)
+def _normalize_title(title: str) -> str:
+    """Normalization body behind normalize_song_title, memoized
+
+    Titles repeat across charts and requests, so a cache hit replaces the
+    regex and translate work with a dict lookup.
+    """
+    # Remove emojis and other special unicode characters
+    title = title.strip().translate(_symbol_translate_table())
+
+    # Collapse multiple spaces, then remove weird symbols but keep
+    # basic punctuation
+    title = _DISALLOWED_RE.sub('', _WHITESPACE_RE.sub(' ', title))
+
+    return title.strip()
+
 class ChartDataProcessor:
     def __init__(self, data_path: str = "Chart.xlsx"):
         """Initialize the chart data processor"""
@@ -18,99 +72,120 @@ class ChartDataProcessor:
         self.chart_data = {}
         self.songs = []
         self.num_charts = 0
+        self._song_index = {}
+        self._title_lc_index = {}
+        self._chart_views = {}
+        self.positions_matrix = None
         
     def normalize_song_title(self, title: str) -> str:
         """Normalize song titles by removing extra spaces and special characters"""
         if pd.isna(title) or title == "":
             return ""
-        
-        # Convert to string and strip whitespace
-        title = str(title).strip()
-        
-        # Remove emojis and other special unicode characters
-        title = ''.join(char for char in title if unicodedata.category(char)[0] != 'S')
-        
-        # Remove multiple spaces
-        title = re.sub(r'\s+', ' ', title)
-        
-        # Remove weird symbols but keep basic punctuation
-        title = re.sub(r'[^\w\s\-\.,:;&\(\)\'\"]+', '', title)
-        
-        return title.strip()
+        return _normalize_title(str(title))
     
     def find_chart_columns(self, df: pd.DataFrame) -> List[Tuple[str, int]]:
         """Find chart columns (1-19) regardless of their data type in the Excel/CSV file"""
         chart_columns = []
-        
-        print("🔍 Analyzing column headers...")
-        print(f"📋 Found columns: {list(df.columns)}")
-        
+
+        logger.debug("🔍 Analyzing column headers...")
+        logger.debug("📋 Found columns: %s", list(df.columns))
+
+        # Single pass, no per-column try/except: a header counts when its
+        # stripped string form is all digits or it's a plain number
         for col in df.columns:
-            # Convert column name to string for analysis
             col_str = str(col).strip()
-            
-            # Try to match numbers 1-99
-            try:
-                # Handle different possible formats
-                if col_str.isdigit():
-                    chart_num = int(col_str)
-                elif isinstance(col, (int, float)):
-                    chart_num = int(col)
-                else:
-                    # Try to extract number from string
-                    number_match = re.match(r'^(\d+)$', col_str)
-                    if number_match:
-                        chart_num = int(number_match.group(1))
-                    else:
-                        continue
-                
-                # Check if it's in a reasonable range
-                if 1 <= chart_num <= 99:
-                    chart_columns.append((col, chart_num))
-                    print(f"✅ Found chart column: '{col}' -> Chart {chart_num}")
-            
-            except (ValueError, TypeError):
+
+            if col_str.isdigit():
+                chart_num = int(col_str)
+            elif isinstance(col, (int, float)) and not pd.isna(col):
+                chart_num = int(col)
+            else:
                 continue
-        
+
+            # Check if it's in a reasonable range
+            if 1 <= chart_num <= 99:
+                chart_columns.append((col, chart_num))
+                logger.debug("✅ Found chart column: '%s' -> Chart %s", col, chart_num)
+
         # Sort by chart number to ensure proper order
         chart_columns.sort(key=lambda x: x[1])
-        
+
         return chart_columns
-    
+
     def find_song_column(self, df: pd.DataFrame) -> Optional[str]:
         """Find the song column, handling different possible names"""
-        possible_song_columns = ['Song', 'song', 'SONG', 'Title', 'title', 'TITLE', 'Track', 'track', 'TRACK']
-        
-        for col in df.columns:
-            col_str = str(col).strip()
-            if col_str in possible_song_columns:
-                print(f"✅ Found song column: '{col}'")
-                return col
-        
-        # If exact match not found, try partial matches
+        song_column_names = {'song', 'title', 'track'}
+
+        # One pass over the headers: exact matches win, the first partial
+        # match is remembered as a fallback
+        partial_match = None
         for col in df.columns:
             col_str = str(col).strip().lower()
-            if 'song' in col_str or 'title' in col_str or 'track' in col_str:
-                print(f"✅ Found song column (partial match): '{col}'")
+            if col_str in song_column_names:
+                logger.info("✅ Found song column: '%s'", col)
                 return col
-        
+            if partial_match is None and any(name in col_str for name in song_column_names):
+                partial_match = col
+
+        if partial_match is not None:
+            logger.info("✅ Found song column (partial match): '%s'", partial_match)
+            return partial_match
+
         return None
     
+    def _cache_path(self) -> str:
+        """Path of the parse cache for the current data file
+
+        The file's mtime is baked into the name, so editing the data file
+        automatically invalidates the cache.
+        """
+        mtime = int(os.path.getmtime(self.data_path))
+        return f"{self.data_path}.cache-{mtime}.pkl"
+
+    def _load_cache(self) -> Optional[Tuple[List[Dict], int]]:
+        """Load (songs, num_charts) from the parse cache, if it's fresh"""
+        try:
+            cache_path = self._cache_path()
+            if not os.path.exists(cache_path):
+                return None
+            with open(cache_path, 'rb') as f:
+                songs, num_charts = pickle.load(f)
+            logger.info("⚡ Loaded %s songs from parse cache: %s", len(songs), cache_path)
+            return songs, num_charts
+        except Exception as e:
+            logger.warning("⚠️  Ignoring unreadable parse cache: %s", e)
+            return None
+
+    def _save_cache(self):
+        """Write the parse cache and remove caches for older file versions"""
+        try:
+            cache_path = self._cache_path()
+            with open(cache_path, 'wb') as f:
+                pickle.dump((self.songs, self.num_charts), f, protocol=5)
+            # Clean up caches keyed to previous mtimes of the data file
+            cache_dir = os.path.dirname(os.path.abspath(self.data_path))
+            prefix = os.path.basename(self.data_path) + ".cache-"
+            for name in os.listdir(cache_dir):
+                if name.startswith(prefix) and name != os.path.basename(cache_path):
+                    os.remove(os.path.join(cache_dir, name))
+        except Exception as e:
+            logger.warning("⚠️  Could not write parse cache: %s", e)
+
     def read_data_file(self) -> pd.DataFrame:
         """Read data from Excel or CSV file based on file extension"""
         file_ext = os.path.splitext(self.data_path)[1].lower()
         
         if file_ext in ['.xlsx', '.xls']:
-            print(f"📊 Reading Excel file: {self.data_path}")
+            logger.info("📊 Reading Excel file: %s", self.data_path)
             # Try to read with sheet name 'Chart' first, then fall back to first sheet
             try:
-                df = pd.read_excel(self.data_path, sheet_name="Chart")
+                df = pd.read_excel(self.data_path, sheet_name="Chart", **_EXCEL_ENGINE)
             except:
                 # If 'Chart' sheet doesn't exist, read the first sheet
-                df = pd.read_excel(self.data_path)
-                print(f"ℹ️ Using first sheet from Excel file")
+                df = pd.read_excel(self.data_path, **_EXCEL_ENGINE)
+                logger.info("ℹ️ Using first sheet from Excel file")
         elif file_ext == '.csv':
-            print(f"📊 Reading CSV file: {self.data_path}")
+            logger.info("📊 Reading CSV file: %s", self.data_path)
             df = pd.read_csv(self.data_path)
         else:
             raise ValueError(f"Unsupported file format: {file_ext}. Please use .xlsx, .xls, or .csv files.")
@@ -120,10 +195,19 @@ class ChartDataProcessor:
     def process_chart_data(self) -> Tuple[bool, str]:
         """Read and process the Excel/CSV chart data"""
         try:
+            # On warm starts, skip the (slow) Excel/CSV parse entirely and
+            # reuse the pickled result from the previous run
+            cached = self._load_cache()
+            if cached is not None:
+                self.songs, self.num_charts = cached
+                self._build_lookup_structures()
+                file_type = "Excel" if os.path.splitext(self.data_path)[1].lower() in ['.xlsx', '.xls'] else "CSV"
+                return True, f"Successfully loaded {len(self.songs)} songs from {self.num_charts} charts ({file_type} file, cached)"
+
             # Read data file
             df = self.read_data_file()
             
-            print(f"📊 Sheet dimensions: {df.shape[0]} rows × {df.shape[1]} columns")
+            logger.info("📊 Sheet dimensions: %s rows × %s columns", df.shape[0], df.shape[1])
             
             # Find song column
             song_column = self.find_song_column(df)
@@ -134,77 +218,74 @@ class ChartDataProcessor:
             chart_columns = self.find_chart_columns(df)
             
             if not chart_columns:
-                print("❌ No chart columns found!")
-                print("🔍 Available columns:", list(df.columns))
-                print("🔍 Column types:", [f"{col}: {type(col)}" for col in df.columns])
+                logger.warning("❌ No chart columns found!")
+                logger.warning("🔍 Available columns: %s", list(df.columns))
+                logger.warning("🔍 Column types: %s", [f"{col}: {type(col)}" for col in df.columns])
                 return False, "❌ Error: No chart columns (numbered columns) found in the data file"
             
             self.num_charts = len(chart_columns)
-            print(f"✅ Found {self.num_charts} chart editions: {[f'Chart {num}' for _, num in chart_columns]}")
-            
-            # Process each song
-            processed_songs = 0
-            skipped_rows = 0
-            
-            for idx, row in df.iterrows():
-                song_title = self.normalize_song_title(row.get(song_column, ""))
-                
-                if not song_title:
-                    skipped_rows += 1
-                    continue
-                
-                song_data = {
-                    "title": song_title,
-                    "positions": {}
-                }
-                
-                # Process positions for each chart
-                for col_name, chart_num in chart_columns:
-                    position = row.get(col_name)
-                    
-                    # Handle different representations of missing data
-                    if pd.isna(position) or position == "--" or position == "" or position == " ":
-                        song_data["positions"][chart_num] = None
-                    else:
-                        try:
-                            # Convert to integer position
-                            position_val = str(position).strip()
-                            if position_val == "--" or position_val == "":
-                                song_data["positions"][chart_num] = None
-                            else:
-                                song_data["positions"][chart_num] = int(float(position_val))
-                        except (ValueError, TypeError):
-                            print(f"⚠️  Warning: Invalid position value '{position}' for song '{song_title}' in chart {chart_num}")
-                            song_data["positions"][chart_num] = None
-                
-                # Calculate total charts appeared in
-                song_data["total_charts"] = sum(
-                    1 for pos in song_data["positions"].values() 
-                    if pos is not None
-                )
-                
-                # Only include songs that appear in at least one chart
-                if song_data["total_charts"] > 0:
-                    self.songs.append(song_data)
-                    processed_songs += 1
-                else:
-                    skipped_rows += 1
-            
-            print(f"✅ Successfully processed {processed_songs} songs")
-            print(f"⏭️  Skipped {skipped_rows} rows (empty or no chart positions)")
-            print(f"📈 Total charts: {self.num_charts}")
+            logger.info("✅ Found %s chart editions: %s", self.num_charts, [f"Chart {num}" for _, num in chart_columns])
             
+            # Process all songs with vectorized column operations instead
+            # of a per-row iterrows() loop
+            chart_col_names = [col for col, _ in chart_columns]
+            chart_nums = [num for _, num in chart_columns]
+
+            titles = df[song_column].map(self.normalize_song_title)
+
+            # Blank out the different representations of missing data
+            # ('--', empty/whitespace cells), then coerce to numbers
+            pos_raw = df[chart_col_names].replace(r'^\s*(--)?\s*$', np.nan, regex=True)
+            pos_numeric = pos_raw.apply(pd.to_numeric, errors='coerce')
+
+            # Values that were present but not numeric get the same warning
+            # the old per-cell conversion produced
+            invalid_mask = pos_raw.notna() & pos_numeric.isna()
+            invalid_mask.loc[titles == "", :] = False
+            if invalid_mask.values.any():
+                for row_idx, col_idx in zip(*np.where(invalid_mask.values)):
+                    logger.warning("⚠️  Warning: Invalid position value '%s' for song '%s' in chart %s",
+                                   pos_raw.iat[row_idx, col_idx], titles.iat[row_idx], chart_nums[col_idx])
+
+            # Only include titled songs that appear in at least one chart
+            total_charts = pos_numeric.notna().sum(axis=1)
+            keep = (titles != "") & (total_charts > 0)
+
+            for title, charts, row in zip(titles[keep],
+                                          total_charts[keep],
+                                          pos_numeric.loc[keep].itertuples(index=False, name=None)):
+                self.songs.append({
+                    "title": title,
+                    "positions": {
+                        chart_num: (None if pd.isna(value) else int(value))
+                        for chart_num, value in zip(chart_nums, row)
+                    },
+                    "total_charts": int(charts)
+                })
+
+            processed_songs = len(self.songs)
+            skipped_rows = int(len(df) - keep.sum())
+
+            # Persist the parsed result so the next startup skips the parse
+            self._save_cache()
+
+            self._build_lookup_structures()
+
+            logger.info("✅ Successfully processed %s songs", processed_songs)
+            logger.info("⏭️  Skipped %s rows (empty or no chart positions)", skipped_rows)
+            logger.info("📈 Total charts: %s", self.num_charts)
+
             # Show some sample data for verification
             if processed_songs > 0:
-                print(f"\n📋 Sample processed songs:")
+                logger.debug("📋 Sample processed songs:")
                 for i, song in enumerate(self.songs[:3]):
-                    chart_positions = [f"Chart {num}: {pos if pos else '--'}" 
+                    chart_positions = [f"Chart {num}: {pos if pos else '--'}"
                                      for num, pos in sorted(song["positions"].items())[:5]]
-                    print(f"   {i+1}. '{song['title']}' - {', '.join(chart_positions)}... (appears in {song['total_charts']} charts)")
-            
+                    logger.debug("   %s. '%s' - %s... (appears in %s charts)", i + 1, song['title'], ', '.join(chart_positions), song['total_charts'])
+
             file_type = "Excel" if os.path.splitext(self.data_path)[1].lower() in ['.xlsx', '.xls'] else "CSV"
             return True, f"Successfully loaded {processed_songs} songs from {self.num_charts} charts ({file_type} file)"
-            
+
         except FileNotFoundError:
             return False, f"❌ Error: Data file '{self.data_path}' not found"
         except ValueError as e:
@@ -214,46 +295,88 @@ class ChartDataProcessor:
                 return False, f"❌ Error reading data file: {str(e)}"
         except Exception as e:
             return False, f"❌ Unexpected error: {str(e)}"
-    
+
+    def _build_lookup_structures(self):
+        """Build the derived per-song lookup structures
+
+        Runs after self.songs is populated (either parsed fresh or loaded
+        from the parse cache).
+        """
+        # Build lookup structures so request handlers get O(1) access by title
+        self._song_index = {}
+        self._title_lc_index = {}
+        for song_id, song in enumerate(self.songs):
+            song["song_id"] = song_id
+            # Contiguous view of the positions dict, indexed directly by
+            # chart number (slot 0 unused) so hot loops skip dict hashing
+            song["positions_list"] = [
+                song["positions"].get(num)
+                for num in range(self.num_charts + 1)
+            ]
+            # Bitmask with bit k set when the song charted in chart k,
+            # so "charted before chart N" is a single mask-and
+            bits = 0
+            for chart_num, pos in song["positions"].items():
+                if pos is not None:
+                    bits |= 1 << chart_num
+            song["chart_bits"] = bits
+            # Most recent charted position (used by the All-Songs view)
+            song["_latest_position"] = next(
+                (pos for pos in reversed(song["positions_list"])
+                 if pos is not None),
+                None
+            )
+            # First occurrence wins, matching the old linear-scan behaviour
+            # for duplicate titles
+            self._song_index.setdefault(song["title"], song)
+            # Lowercased view so case-insensitive lookups (song pages,
+            # comment keys) skip per-call .lower() over every title
+            self._title_lc_index.setdefault(song["title"].lower().strip(), song)
+
+        # Dense positions matrix (song_id × chart number) so per-song stats
+        # can be computed with vectorized NumPy reductions instead of
+        # Python loops; column 0 is unused since charts are 1-based
+        self.positions_matrix = np.full(
+            (len(self.songs), self.num_charts + 1),
+            MISSING_POSITION, dtype=np.int16
+        )
+        for song_id, song in enumerate(self.songs):
+            for chart_num, pos in song["positions"].items():
+                if pos is not None:
+                    self.positions_matrix[song_id, chart_num] = pos
+
+        # Pre-sorted per-chart views so get_chart_data is a plain dict
+        # lookup instead of a scan-and-sort over every song per request.
+        # The previous position is carried along while walking each song's
+        # charts in order, replacing the old backwards inner search.
+        self._chart_views = {num: [] for num in range(1, self.num_charts + 1)}
+        for song in self.songs:
+            prev_position = None
+            for chart_num in range(1, self.num_charts + 1):
+                position = song["positions"].get(chart_num)
+                if position is not None:
+                    self._chart_views[chart_num].append({
+                        "position": position,
+                        "prev_position": prev_position,
+                        "title": song["title"],
+                        "total_charts": song["total_charts"]
+                    })
+                prev_position = position
+        for view in self._chart_views.values():
+            view.sort(key=itemgetter("position"))
+
     def get_chart_data(self, chart_number: int) -> List[Dict]:
         """Get data for a specific chart number, sorted by position"""
-        chart_data = []
-        
-        for song in self.songs:
-            position = song["positions"].get(chart_number)
-            
-            if position is not None:
-                # Get previous position
-                prev_position = None
-                if chart_number > 1:
-                    # Find the previous chart number that exists
-                    for prev_num in range(chart_number - 1, 0, -1):
-                        if prev_num in song["positions"]:
-                            prev_position = song["positions"].get(prev_num)
-                            break
-                
-                chart_data.append({
-                    "position": position,
-                    "prev_position": prev_position,
-                    "title": song["title"],
-                    "total_charts": song["total_charts"]
-                })
-        
-        # Sort by position
-        chart_data.sort(key=lambda x: x["position"])
-        
-        return chart_data
+        return self._chart_views.get(chart_number, [])
     
     def get_song_history(self, song_title: str) -> Dict:
-        """Get the complete chart history for a specific song"""
-        for song in self.songs:
-            if song["title"].lower() == song_title.lower():
-                return {
-                    "title": song["title"],
-                    "positions": song["positions"],
-                    "total_charts": song["total_charts"]
-                }
-        return None
+        """Get the complete chart history for a specific song
+
+        O(1) dict lookup against the lowercased title index built in
+        _build_lookup_structures (the old linear scan lowercased every
+        title on every call).
+        """
+        return self._title_lc_index.get(song_title.lower())
     
     def get_all_songs_data(self) -> List[Dict]:
         """Get all songs with their complete data"""
@@ -7,8 +7,12 @@ bind = "0.0.0.0:5001"
 backlog = 2048
 
 # Worker Processes
-workers = multiprocessing.cpu_count() * 2 + 1  # Recommended formula
-worker_class = "sync"  # Use "gevent" for async if needed
+# Threaded workers: request handlers are mostly I/O-bound (database,
+# Twitch API), so threads keep the CPU busy while a sync worker would
+# block one-request-at-a-time. Fewer processes are needed as a result.
+workers = multiprocessing.cpu_count()
+worker_class = "gthread"
+threads = 8
 worker_connections = 1000
 timeout = 120  # Increase if you have long-running requests
 keepalive = 2
@@ -47,6 +51,14 @@ def worker_int(worker):
 def pre_fork(server, worker):
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
+def post_fork(server, worker):
+    # With preload_app the database pool and the log listener thread are
+    # created in the master before forking; neither survives the fork, so
+    # each worker rebuilds its own pool and restarts the listener here
+    from app import comment_manager, restart_log_listener
+    comment_manager._init_pool()
+    restart_log_listener()
+
 def pre_exec(server):
     server.log.info("Forked child, re-executing.")
 
@@ -54,8 +66,10 @@ def on_exit(server):
     server.log.info("Server is shutting down")
 
 # Preload Application
-# This loads your app before forking workers - can save memory but may cause issues with some apps
-preload_app = False
+# Load the app (and parse the chart data) once in the master before
+# forking: workers share the loaded catalog via copy-on-write instead of
+# each re-parsing Chart.xlsx and holding its own copy
+preload_app = True
 
 # Debugging (set to False in production)
 reload = False  # Auto-reload on code changes
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+WSGI Entry Point
+Exposes the Flask app for WSGI servers (e.g. gunicorn wsgi:application)
+"""
+from app import app
+
+application = app